@@ -1,30 +1,15 @@
 import streamlit as st
 import numpy as np
-import numpy_financial as npf
 import pandas as pd
-import copy
 
+# CoW is always on (and the option deprecated) from pandas 3; enable it explicitly on pandas 2
+if int(pd.__version__.split('.')[0]) == 2:
+    pd.options.mode.copy_on_write = True
 
 
 page_title = "Should I use a pension, LISA, or ISA to save for retirement?"
 
-
-st.set_page_config(
-    page_title=page_title,
-    page_icon=":money_with_wings:",
-    menu_items={
-        'Report a Bug': 'mailto:ok_west_6958@proton.me?subject=Issue%20with%20' + page_title.replace(" ","%20") + '%20app'
-        }
-)
-
-
-
-st.write('# '+page_title)
-
-
-
-with st.expander('How to use this calculator'):
-    """This calculator is for determining which savings vehicle might be best to utilise
+how_to_use_text = """This calculator is for determining which savings vehicle might be best to utilise
     if you have disposable monthly income that you want to put towards retirement
     \nImportantly this is not a traditional pension forecast tool like you might 
     have used [here](https://www.pensionbee.com/pension-calculator). If you have not used a pension 
@@ -53,6 +38,30 @@ with st.expander('How to use this calculator'):
     Likewise if you need a sizeable fund that will not be covered by a 25% pension lump sum (such as any remaining 
     mortgage balance), then again a pension may not be suitable"""
 
+rates_of_return_text = """Pensions, LISAs, and ISAs are all just account wrappers which you use to then invest in assets. 
+    It is these assets which generate a return, not the account itself
+    \nThe choice of account should not significantly impact the expected rate of return of the investments held within it
+    \nIf you really want to test different returns from different accounts (because you are concerned about fees for example), 
+    you will need to use the calculator for each rate of return and note and compare the results yourself"""
+
+
+st.set_page_config(
+    page_title=page_title,
+    page_icon=":money_with_wings:",
+    menu_items={
+        'Report a Bug': 'mailto:ok_west_6958@proton.me?subject=Issue%20with%20' + page_title.replace(" ","%20") + '%20app'
+        }
+)
+
+
+
+st.write('# '+page_title)
+
+
+
+with st.expander('How to use this calculator'):
+    st.markdown(how_to_use_text)
+
 st.divider()
 
 """# Monthly deposits"""
@@ -65,6 +74,258 @@ hrt_ni_rate = 0.02
 
 retirement_vehicles = ['pension','LISA','ISA']
 
+net_take_home_column_config = st.column_config.NumberColumn(help="""Amount taken/received net to you per month (will be negative when 
+                                                           saving for retirement and positive when withdrawing)""")
+deposit_column_config = st.column_config.NumberColumn(help="""Amount which will be deposited/withdrawn from the fund by month""")
+fund_column_config = st.column_config.NumberColumn(help="""Total value of the fund by month (including growth)""")
+month_returns_column_config = st.column_config.NumberColumn(help="""How much the fund generated each month based on it's value and the expected rate of return""")
+
+schedule_columns = ['Net take home','Pension deposit','LISA deposit','ISA deposit','Pension fund','LISA fund','ISA fund',
+                    'Pension fund month returns','LISA fund month returns','ISA fund month returns']
+
+schedule_column_config = {
+    'Net take home': net_take_home_column_config,
+    'Pension deposit': deposit_column_config,
+    'LISA deposit': deposit_column_config,
+    'ISA deposit': deposit_column_config,
+    'Pension fund': fund_column_config,
+    'LISA fund': fund_column_config,
+    'ISA fund': fund_column_config,
+    'Pension fund month returns': month_returns_column_config,
+    'LISA fund month returns': month_returns_column_config,
+    'ISA fund month returns': month_returns_column_config
+}
+
+
+
+def fv(rate, nper, pmt, pv=0):
+    if rate == 0:
+        return -(pv + pmt * nper)
+    growth_factor = (1 + rate) ** nper
+    return -(pv * growth_factor + pmt * (growth_factor - 1) / rate)
+
+
+def fv_schedule(rate, nper, pmt, pv=0):
+    if rate == 0:
+        return -(pv + pmt * np.arange(1, nper + 1)[:, None])
+    growth_factor = np.cumprod(np.full(nper, 1 + rate))[:, None]
+    return -(pv * growth_factor + pmt * (growth_factor - 1) / rate)
+
+
+def nper(rate, pmt, pv):
+    if rate == 0:
+        return -pv / pmt
+    with np.errstate(invalid='ignore'):
+        return np.log(pmt / (pmt + pv * rate)) / np.log(1 + rate)
+
+
+def pmt(rate, nper, pv):
+    if rate == 0:
+        return -pv / nper
+    growth_factor = (1 + rate) ** nper
+    return -pv * growth_factor * rate / (growth_factor - 1)
+
+
+def vehicle_payments(monthly_deposit, pension_monthly_net_deposit, lisa_monthly_deposit,
+                     retirement_monthly_withdrawal, pension_monthly_net_withdrawal):
+    deposits = np.asarray([pension_monthly_net_deposit,lisa_monthly_deposit,monthly_deposit])
+    withdrawals = np.asarray([-pension_monthly_net_withdrawal,-retirement_monthly_withdrawal,-retirement_monthly_withdrawal])
+    return deposits, withdrawals
+
+
+def retirement_withdrawal_figures(monthly_retirement_growth_rate, drawdown_months, withdrawals, retirement_fvs, retirement_tax_rate):
+
+    retirement_withdrawal_durations = abs(nper(
+        monthly_retirement_growth_rate,
+        withdrawals,
+        retirement_fvs
+    ))
+
+    retirement_withdrawal_pmt = -pmt(
+        monthly_retirement_growth_rate,
+        drawdown_months,
+        retirement_fvs
+    )
+
+    retirement_withdrawal_pmt[0] = retirement_withdrawal_pmt[0] * 0.25 + retirement_withdrawal_pmt[0] * 0.75 * (1 - retirement_tax_rate)
+
+    return retirement_withdrawal_durations, retirement_withdrawal_pmt
+
+
+def schedule_frame(schedule, monthly_growth_rate, monthly_retirement_growth_rate, retirement_month):
+
+    monthly_growth_rates = np.repeat([monthly_growth_rate, monthly_retirement_growth_rate], [retirement_month, len(schedule) - retirement_month])
+
+    np.multiply(monthly_growth_rates[:, None], schedule[:, 4:7], out=schedule[:, 7:])
+
+    schedule_df = pd.DataFrame(schedule, columns=schedule_columns, copy=False)
+    schedule_df.insert(0, 'Month', np.arange(1, len(schedule) + 1, dtype=np.int32))
+
+    return schedule_df
+
+
+
+@st.cache_data(max_entries=100)
+def compute_schedule(monthly_deposit, pension_monthly_net_deposit, lisa_monthly_deposit, growth_rate, retirement_age,
+                     retirement_monthly_withdrawal, pension_monthly_net_withdrawal, retirement_growth_rate, retirement_duration,
+                     retirement_tax_rate):
+
+    monthly_growth_rate = growth_rate / 100 / 12
+    monthly_retirement_growth_rate = retirement_growth_rate / 100 / 12
+
+    deposits, withdrawals = vehicle_payments(
+        monthly_deposit,
+        pension_monthly_net_deposit,
+        lisa_monthly_deposit,
+        retirement_monthly_withdrawal,
+        pension_monthly_net_withdrawal
+    )
+
+    accumulation_months = retirement_age * 12
+    drawdown_months = retirement_duration * 12
+
+    retirement_fvs = -fv(
+        monthly_growth_rate,
+        accumulation_months,
+        deposits
+    )
+
+    retirement_withdrawal_durations, retirement_withdrawal_pmt = retirement_withdrawal_figures(
+        monthly_retirement_growth_rate,
+        drawdown_months,
+        withdrawals,
+        retirement_fvs,
+        retirement_tax_rate
+    )
+
+
+    schedule = np.empty((accumulation_months + drawdown_months, len(schedule_columns)))
+
+    schedule[:accumulation_months, 0] = -monthly_deposit
+    schedule[:accumulation_months, 1:4] = deposits
+    schedule[:accumulation_months, 4:7] = -fv_schedule(
+        monthly_growth_rate,
+        accumulation_months,
+        deposits
+    )
+
+    schedule[accumulation_months:, 0] = retirement_monthly_withdrawal
+    schedule[accumulation_months:, 1:4] = withdrawals
+    schedule[accumulation_months:, 4:7] = -fv_schedule(
+        monthly_retirement_growth_rate,
+        drawdown_months,
+        withdrawals,
+        retirement_fvs
+    )
+
+    schedule_df = schedule_frame(schedule, monthly_growth_rate, monthly_retirement_growth_rate, accumulation_months)
+
+
+    return retirement_fvs, retirement_withdrawal_durations, retirement_withdrawal_pmt, schedule_df
+
+
+@st.cache_data(max_entries=100)
+def build_10_years_less_schedule(monthly_deposit, pension_monthly_net_deposit, lisa_monthly_deposit, growth_rate, retirement_age,
+                                 retirement_monthly_withdrawal, pension_monthly_net_withdrawal, retirement_growth_rate, retirement_duration,
+                                 retirement_tax_rate):
+
+    monthly_growth_rate = growth_rate / 100 / 12
+    monthly_retirement_growth_rate = retirement_growth_rate / 100 / 12
+
+    deposits, withdrawals = vehicle_payments(
+        monthly_deposit,
+        pension_monthly_net_deposit,
+        lisa_monthly_deposit,
+        retirement_monthly_withdrawal,
+        pension_monthly_net_withdrawal
+    )
+
+    accumulation_months = (retirement_age - 10) * 12
+    drawdown_months = retirement_duration * 12
+    retirement_month = accumulation_months + 120
+
+    retirement_fvs_10_years_less = -fv(
+        monthly_growth_rate,
+        accumulation_months,
+        deposits
+    )
+
+    growth_factors_10_years = (1 + monthly_growth_rate) ** np.arange(1, 121)
+
+    retirement_fvs_10_years_less_at_age = retirement_fvs_10_years_less * growth_factors_10_years[-1]
+
+    retirement_withdrawal_durations_10_years_less, retirement_withdrawal_pmt_10_years_less = retirement_withdrawal_figures(
+        monthly_retirement_growth_rate,
+        drawdown_months,
+        withdrawals,
+        retirement_fvs_10_years_less_at_age,
+        retirement_tax_rate
+    )
+
+
+    schedule_10_years_less = np.empty((retirement_month + drawdown_months, len(schedule_columns)))
+
+    schedule_10_years_less[:accumulation_months, 0] = -monthly_deposit
+    schedule_10_years_less[:accumulation_months, 1:4] = deposits
+    schedule_10_years_less[:accumulation_months, 4:7] = -fv_schedule(
+        monthly_growth_rate,
+        accumulation_months,
+        deposits
+    )
+
+    schedule_10_years_less[accumulation_months:retirement_month, 0:4] = 0
+    schedule_10_years_less[accumulation_months:retirement_month, 4:7] = growth_factors_10_years[:, None] * retirement_fvs_10_years_less
+
+    schedule_10_years_less[retirement_month:, 0] = retirement_monthly_withdrawal
+    schedule_10_years_less[retirement_month:, 1:4] = withdrawals
+    schedule_10_years_less[retirement_month:, 4:7] = -fv_schedule(
+        monthly_retirement_growth_rate,
+        drawdown_months,
+        withdrawals,
+        retirement_fvs_10_years_less_at_age
+    )
+
+    schedule_10_years_less_df = schedule_frame(schedule_10_years_less, monthly_growth_rate, monthly_retirement_growth_rate, retirement_month)
+
+
+    return (retirement_fvs_10_years_less, retirement_fvs_10_years_less_at_age, retirement_withdrawal_durations_10_years_less,
+            retirement_withdrawal_pmt_10_years_less, schedule_10_years_less_df)
+
+
+
+@st.cache_data(max_entries=100)
+def build_lisa_schedule(monthly_deposit, lisa_monthly_deposit, growth_rate, retirement_age,
+                        retirement_monthly_withdrawal, retirement_growth_rate, retirement_duration):
+
+    monthly_growth_rate = growth_rate / 100 / 12
+    monthly_retirement_growth_rate = retirement_growth_rate / 100 / 12
+
+    accumulation_months = retirement_age * 12
+    drawdown_months = retirement_duration * 12
+
+    lisa_schedule = np.empty((accumulation_months + drawdown_months, 5))
+
+    lisa_schedule[:accumulation_months, 0] = -monthly_deposit
+    lisa_schedule[:accumulation_months, 1] = monthly_deposit * 0.25
+    lisa_schedule[:accumulation_months, 2] = lisa_monthly_deposit
+    lisa_schedule[:accumulation_months, 3] = -fv_schedule(monthly_growth_rate, accumulation_months, lisa_monthly_deposit)[:, 0]
+    np.multiply(monthly_growth_rate, lisa_schedule[:accumulation_months, 3], out=lisa_schedule[:accumulation_months, 4])
+
+    lisa_schedule[accumulation_months:, 0] = retirement_monthly_withdrawal
+    lisa_schedule[accumulation_months:, 1] = 0
+    lisa_schedule[accumulation_months:, 2] = -retirement_monthly_withdrawal
+    lisa_schedule[accumulation_months:, 3] = -fv_schedule(monthly_retirement_growth_rate, drawdown_months, -retirement_monthly_withdrawal, lisa_schedule[accumulation_months - 1, 3])[:, 0]
+    np.multiply(monthly_retirement_growth_rate, lisa_schedule[accumulation_months:, 3], out=lisa_schedule[accumulation_months:, 4])
+
+    lisa_schedule_df = pd.DataFrame(
+        lisa_schedule,
+        columns=['Net take home','LISA bonus','LISA deposit','LISA fund','LISA fund month returns'],
+        copy=False
+    )
+    lisa_schedule_df.insert(0, 'Month', np.arange(1, accumulation_months + drawdown_months + 1, dtype=np.int32))
+
+    return lisa_schedule_df
+
 
 
 
@@ -80,7 +341,7 @@ include_lisa = st.toggle(
 lisa_reminder = ['green', 'included'] if include_lisa else ['red','excluded']    
 
 st.write(
-    """:{0[0]}[LISAs {0[1]}]""".format(lisa_reminder)
+    f""":{lisa_reminder[0]}[LISAs {lisa_reminder[1]}]"""
     )
 
 
@@ -97,11 +358,11 @@ monthly_deposit = st.number_input(
 
 if monthly_deposit > 333.33 and include_lisa:
     st.warning(
-        """Saving this much per month would take you over the yearly LISA deposit limit. 
+        f"""Saving this much per month would take you over the yearly LISA deposit limit. 
         It may be beneficial to review the results when saving £333 (to not breach the LISA limit) 
         to see if the LISA is valuable for this amount, and then reuse the calculator for any remaining additional 
-        deposits. \n\n For example, use the calculator for £333, then use the calculator again for your remaining £{0:,}
-        \n\nThe calculator will display LISA results for the amount you have entered (£{1:,}) which could be misleading""".format(monthly_deposit - 333,monthly_deposit))
+        deposits. \n\n For example, use the calculator for £333, then use the calculator again for your remaining £{monthly_deposit - 333:,}
+        \n\nThe calculator will display LISA results for the amount you have entered (£{monthly_deposit:,}) which could be misleading""")
 
 salary_sacrifice = st.radio(
     'Do you have access to a salary sacrifice pension?',
@@ -123,6 +384,11 @@ current_tax = st.radio(
         again for any contributions that would have been BRT. If you are neither then this calculator will not be suitable for you"""
 )
 
+if current_tax == 'BRT':
+    current_tax_const = ["basic rate", brt_tax_rate, brt_ni_rate]
+else:
+    current_tax_const = ["higher rate", hrt_tax_rate, hrt_ni_rate]
+
 retirement_tax = st.radio(
     'Do you expect to be a Basic Rate Tax (BRT) payer or Higher Rate Tax (HRT) payer in retirement?',
     tax_bands,
@@ -134,6 +400,11 @@ retirement_tax = st.radio(
         the BRT threshold or above the additional rate threshold"""
 )
 
+if retirement_tax == 'BRT':
+    retirement_tax_const = ['basic rate',brt_tax_rate]
+else:
+    retirement_tax_const = ['higher rate',hrt_tax_rate]
+
 if retirement_tax == 'HRT' and current_tax == 'BRT':
     st.warning("""You have selected that your are currently a BRT and expect to be a HRT in retirement. This is quite unlikely but 
             can happen if for example you have reduced your hours or salary after already accumulating a large pension fund""")
@@ -149,18 +420,18 @@ retirement_age = st.number_input(
 
 if retirement_age <= 10 and include_lisa:
     st.warning(
-        '''You have entered {0} years until retirement and also selected to include LISAs in this analysis. As LISAs 
-        can only be drawn down from after age 60 (without penalty), and can only be contributed to before age 50, a time to retirement of {0} years 
+        f'''You have entered {retirement_age} years until retirement and also selected to include LISAs in this analysis. As LISAs 
+        can only be drawn down from after age 60 (without penalty), and can only be contributed to before age 50, a time to retirement of {retirement_age} years 
         means you would not be able to contribute to a LISA. You can still view the results of this analysis including LISAs, but this may 
         not be helpful to you, and you will not be able to view a more in depth breakdown of the LISA results. This analysis will 
-        not consider the LISA early withdrawal penalty'''.format(retirement_age)
+        not consider the LISA early withdrawal penalty'''
     )
 elif retirement_age <= 20 and include_lisa:
     st.warning(
-        '''You have entered {0} years until retirement and also selected to include LISAs in this analysis. As LISAs 
+        f'''You have entered {retirement_age} years until retirement and also selected to include LISAs in this analysis. As LISAs 
         can only be drawn down from after age 60 (without penalty), and an account can only be opened before age 40, you should 
         ensure you are able to open a LISA and then decide whether to include them in this analysis. This analysis will not consider the 
-        LISA early withdrawal penalty'''.format(retirement_age)
+        LISA early withdrawal penalty'''
     )   
 
 
@@ -177,24 +448,16 @@ growth_rate = st.number_input(
 )
 
 with st.expander('Why can I not enter different rates of return for different accounts?'):
-    """Pensions, LISAs, and ISAs are all just account wrappers which you use to then invest in assets. 
-    It is these assets which generate a return, not the account itself
-    \nThe choice of account should not significantly impact the expected rate of return of the investments held within it
-    \nIf you really want to test different returns from different accounts (because you are concerned about fees for example), 
-    you will need to use the calculator for each rate of return and note and compare the results yourself"""
+    st.markdown(rates_of_return_text)
 
     
 
 
 
-if current_tax == 'BRT' and salary_sacrifice == 'Yes':
-    pension_monthly_net_deposit = monthly_deposit / (1 - brt_tax_rate - brt_ni_rate)
-elif current_tax == 'BRT' and salary_sacrifice == 'No':
-    pension_monthly_net_deposit = monthly_deposit / (1 - brt_tax_rate)
-elif current_tax == 'HRT' and salary_sacrifice == 'Yes':
-    pension_monthly_net_deposit = monthly_deposit / (1 - hrt_tax_rate - hrt_ni_rate)
+if salary_sacrifice == 'Yes':
+    pension_monthly_net_deposit = monthly_deposit / (1 - current_tax_const[1] - current_tax_const[2])
 else:
-    pension_monthly_net_deposit = monthly_deposit / (1 - hrt_tax_rate)
+    pension_monthly_net_deposit = monthly_deposit / (1 - current_tax_const[1])
 
 
 
@@ -203,14 +466,6 @@ else:
 lisa_monthly_deposit = monthly_deposit * 1.25
 
 
-retirement_fvs = -npf.fv(
-    growth_rate / 100 / 12,
-    retirement_age * 12,
-    [pension_monthly_net_deposit,lisa_monthly_deposit,monthly_deposit],
-    0
-)
-
-
 
 
 st.divider()
@@ -258,79 +513,77 @@ with st.expander('Retirement options'):
 
 
 
-if retirement_tax == 'BRT':
-    pension_monthly_net_withdrawal = retirement_monthly_withdrawal / (1 - 0.75 * brt_tax_rate)
-else:
-    pension_monthly_net_withdrawal = retirement_monthly_withdrawal / (1 - 0.75 * hrt_tax_rate)
+pension_monthly_net_withdrawal = retirement_monthly_withdrawal / (1 - 0.75 * retirement_tax_const[1])
+
 
 
 
 
+retirement_fvs, retirement_withdrawal_durations, retirement_withdrawal_pmt, schedule_df = compute_schedule(
+    monthly_deposit,
+    pension_monthly_net_deposit,
+    lisa_monthly_deposit,
+    growth_rate,
+    retirement_age,
+    retirement_monthly_withdrawal,
+    pension_monthly_net_withdrawal,
+    retirement_growth_rate,
+    retirement_duration,
+    retirement_tax_const[1]
+)
+
 
 
-retirement_withdrawal_durations = abs(npf.nper(
-    retirement_growth_rate / 100 / 12,
-    [-pension_monthly_net_withdrawal,-retirement_monthly_withdrawal,-retirement_monthly_withdrawal],
-    retirement_fvs
-))
 
 
 
 """When you retire, you could have accumulated (in addition to other existing pensions/funds):"""
 
-for idx, i in enumerate(retirement_fvs):
-    if (not include_lisa) and idx == 1:
-        pass
-    else:
-        st.write("\n* :green[£{:,.2f}] in your {}".format(i,retirement_vehicles[idx]))
+st.markdown("\n".join(
+    f"* :green[£{i:,.2f}] in your {retirement_vehicles[idx]}"
+    for idx, i in enumerate(retirement_fvs) if include_lisa or idx != 1
+))
 
 
 
 
 st.write(
-    """In order to receive :green[£{:,.2f}] net per month in retirement from these additional funds, you would need to withdraw:""".format(retirement_monthly_withdrawal))
-st.write("""\n* :green[£{:,.2f}] a month from your pension""".format(pension_monthly_net_withdrawal))
+    f"""In order to receive :green[£{retirement_monthly_withdrawal:,.2f}] net per month in retirement from these additional funds, you would need to withdraw:""")
+st.markdown("\n".join(
+    f"* :green[£{i:,.2f}] a month from your {retirement_vehicles[idx]}"
+    for idx, i in enumerate([pension_monthly_net_withdrawal, retirement_monthly_withdrawal, retirement_monthly_withdrawal]) if include_lisa or idx != 1
+))
 
-if include_lisa:
-    st.write("""\n* :green[£{:,.2f}] a month from your LISA""".format(retirement_monthly_withdrawal))
 
-st.write("""\n* :green[£{:,.2f}] a month from your ISA""".format(retirement_monthly_withdrawal))
 
 
 
+st.write(f"This means you could receive :green[£{retirement_monthly_withdrawal:,.2f}] net a month (assuming your fund grows at :green[{retirement_growth_rate:,.2f}%]) for:")
 
+retirement_withdrawal_forever = np.isnan(retirement_withdrawal_durations).tolist()
+retirement_withdrawal_years = (retirement_withdrawal_durations // 12).tolist()
+retirement_withdrawal_months = (retirement_withdrawal_durations / 12 % 1 * 12).tolist()
 
-st.write("This means you could receive :green[£{:,.2f}] net a month (assuming your fund grows at :green[{:,.2f}%]) for:".format(retirement_monthly_withdrawal,retirement_growth_rate))
+retirement_withdrawal_duration_lines = []
 
-for idx, i in enumerate(retirement_withdrawal_durations):
+for idx, vehicle in enumerate(retirement_vehicles):
     if (not include_lisa) and idx == 1:
         pass
-    elif np.isnan(retirement_withdrawal_durations[idx]):
-        st.write("\n* :green[Forever] from your {}".format(retirement_vehicles[idx]))
+    elif retirement_withdrawal_forever[idx]:
+        retirement_withdrawal_duration_lines.append(f"* :green[Forever] from your {vehicle}")
     else:
-        st.write("\n* :green[{:.0f} years] and :green[{:.0f} months] from your {}".format(retirement_withdrawal_durations[idx] // 12,retirement_withdrawal_durations[idx] / 12 % 1 * 12, retirement_vehicles[idx]))
-
-
-
-retirement_withdrawal_pmt = -npf.pmt(
-    retirement_growth_rate / 100 / 12,
-    retirement_duration * 12,
-    retirement_fvs
-)
-
-
+        retirement_withdrawal_duration_lines.append(f"* :green[{retirement_withdrawal_years[idx]:.0f} years] and :green[{retirement_withdrawal_months[idx]:.0f} months] from your {vehicle}")
 
-retirement_withdrawal_pmt[0] = retirement_withdrawal_pmt[0] * 0.25 + retirement_withdrawal_pmt[0] * 0.75 * ((1 - brt_tax_rate) if retirement_tax == 'BRT' else (1-hrt_tax_rate))
+st.markdown("\n".join(retirement_withdrawal_duration_lines))
 
 
 
-st.write("Alternatively, by withdrawing consistently for exactly :green[{:.0f} years] you could be receiving:".format(retirement_duration))
+st.write(f"Alternatively, by withdrawing consistently for exactly :green[{retirement_duration:.0f} years] you could be receiving:")
 
-for idx, i in enumerate(retirement_withdrawal_durations):
-    if (not include_lisa) and idx == 1:
-        pass
-    else:
-        st.write("\n* :green[£{:,.2f}] a month from your {}".format(retirement_withdrawal_pmt[idx], retirement_vehicles[idx]))
+st.markdown("\n".join(
+    f"* :green[£{i:,.2f}] a month from your {retirement_vehicles[idx]}"
+    for idx, i in enumerate(retirement_withdrawal_pmt) if include_lisa or idx != 1
+))
 
 
 st.divider()
@@ -340,83 +593,8 @@ st.divider()
 
 
 
-accumulation_months = np.arange(retirement_age * 12) + 1
-
-accumulation_df = pd.DataFrame(
-    {
-        'Month': accumulation_months,
-        'Growth': growth_rate,
-        'Net take home': -monthly_deposit,
-        'Pension deposit': pension_monthly_net_deposit,
-        'LISA deposit': lisa_monthly_deposit,
-        'ISA deposit': monthly_deposit
-    }
-)
-
-accumulation_df['Pension fund'] = -npf.fv(
-    growth_rate / 100 / 12,
-    accumulation_df['Month'],
-    accumulation_df['Pension deposit'],
-    0
-)
-
-accumulation_df['LISA fund'] = -npf.fv(
-    growth_rate / 100 / 12,
-    accumulation_df['Month'],
-    accumulation_df['LISA deposit'],
-    0
-)
-
-accumulation_df['ISA fund'] = -npf.fv(
-    growth_rate / 100 / 12,
-    accumulation_df['Month'],
-    accumulation_df['ISA deposit'],
-    0
-)
-
-
-drawdown_months = np.arange(retirement_duration * 12) + 1
-
-
-drawdown_df = pd.DataFrame(
-    {
-        'Month': drawdown_months + retirement_age * 12,
-        'Growth': retirement_growth_rate,
-        'Net take home': retirement_monthly_withdrawal,
-        'Pension deposit': -pension_monthly_net_withdrawal,
-        'LISA deposit': -retirement_monthly_withdrawal,
-        'ISA deposit': -retirement_monthly_withdrawal
-    }
-)
-
-drawdown_df['Pension fund'] = -npf.fv(
-    retirement_growth_rate / 100 / 12,
-    drawdown_df['Month'] - retirement_age * 12,
-    drawdown_df['Pension deposit'],
-    retirement_fvs[0]
-)
-
-
-drawdown_df['LISA fund'] = -npf.fv(
-    retirement_growth_rate / 100 / 12,
-    drawdown_df['Month'] - retirement_age * 12,
-    drawdown_df['LISA deposit'],
-    retirement_fvs[1]
-)
-
-drawdown_df['ISA fund'] = -npf.fv(
-    retirement_growth_rate / 100 / 12,
-    drawdown_df['Month'] - retirement_age * 12,
-    drawdown_df['ISA deposit'],
-    retirement_fvs[2]
-)
-
-
-schedule_df = pd.concat([accumulation_df,drawdown_df])
-
-
 if not include_lisa:
-    schedule_df.drop(columns=['LISA deposit', 'LISA fund'], inplace=True)
+    schedule_df = schedule_df.drop(columns=['LISA deposit', 'LISA fund', 'LISA fund month returns'])
 
 
 
@@ -434,7 +612,8 @@ with tab1:
 
     'If you do not understand the accumulation/drawdown figures shown, please read the other "Detailed breakdowns"'
 
-    with st.expander('Show table'):
+    @st.fragment
+    def scheduletable(schedule_df):
 
         show_growth = st.toggle(
             'Show monthly fund investment returns?',
@@ -443,138 +622,77 @@ with tab1:
                 self sustaining (as desired when following the "4% rule" for example)'''
         )
 
-        schedule_df_column_config = {
-            "Net take home": st.column_config.NumberColumn(help="""Amount taken/received net to you per month (will be negative when 
-                                                           saving for retirement and positive when withdrawing)"""),
-        }
-
-        for i in list(schedule_df):
-            if i == 'Month':
-                pass
-            elif i == 'Net take home':
-                schedule_df_column_config[i] = st.column_config.NumberColumn(help="""Amount taken/received net to you per month (will be negative when 
-                                                           saving for retirement and positive when withdrawing)""")
-            elif "deposit" in i:
-                schedule_df_column_config[i] = st.column_config.NumberColumn(help="""Amount which will be deposited/withdrawn from the fund by month""")
-            elif "fund" in i:
-                schedule_df_column_config[i] = st.column_config.NumberColumn(help="""Total value of the fund by month (including growth)""")
-            else:
-                schedule_df_column_config[i] = st.column_config.NumberColumn(help="""How much the fund generated each month based on it's value and the expected rate of return""")
-
-
         if show_growth:
-            config_help_message = st.column_config.NumberColumn(help="""How much the fund generated each month based on it's value and the expected rate of return""")
-            schedule_df['Pension fund month returns'] = schedule_df['Pension fund'] * schedule_df['Growth'] / 100 / 12
-            schedule_df_column_config['Pension fund month returns'] = config_help_message
-            if include_lisa:
-                schedule_df['LISA fund month returns'] = schedule_df['LISA fund'] * schedule_df['Growth'] / 100 / 12
-                schedule_df_column_config['LISA fund month returns'] = config_help_message
-            schedule_df['ISA fund month returns'] = schedule_df['ISA fund'] * schedule_df['Growth'] / 100 / 12
-            schedule_df_column_config['ISA fund month returns'] = config_help_message
-            schedule_df.drop(columns=['Growth'], inplace=True)
-            st.dataframe(
-                schedule_df.set_index('Month')\
-                .style.format('£{:,.2f}'),
-                column_config=schedule_df_column_config
-            )
+            schedule_df_money_columns = [i for i in schedule_df if i != 'Month']
         else:
-            schedule_df.drop(columns=['Growth'], inplace=True)
-            st.dataframe(
-                schedule_df.set_index('Month')\
-                .style.format('£{:,.2f}'),
-                column_config=schedule_df_column_config
-            )
-
-
-
+            schedule_df_money_columns = [i for i in schedule_df if i != 'Month' and "month returns" not in i]
+        st.dataframe(
+            schedule_df[['Month'] + schedule_df_money_columns].set_index('Month')\
+            .style.format('£{:,.2f}'),
+            column_config=schedule_column_config
+        )
 
 
+    with st.expander('Show table'):
+        scheduletable(schedule_df)
 
-with tab2:
 
 
-    if current_tax == 'BRT':
-        current_tax_const = ["basic rate", brt_tax_rate, brt_ni_rate]
-    else:
-        current_tax_const = ["higher rate", hrt_tax_rate, hrt_ni_rate]
 
-    if retirement_tax == 'BRT':
-        retirement_tax_const = ['basic rate',brt_tax_rate]
-    else:
-        retirement_tax_const = ['higher rate',hrt_tax_rate]
 
 
+with tab2:
 
 
     def detailedexplanationsipp():
         st.write(
-            """You are currently a :green[{0}] tax payer so pay :red[{1:.0f}%] tax
-            """.format(current_tax_const[0],current_tax_const[1] * 100))
+            f"""You are currently a :green[{current_tax_const[0]}] tax payer so pay :red[{current_tax_const[1] * 100:.0f}%] tax
+            """)
         st.write(
-            """Depositing :green[£{:,.2f}] into your SIPP will result in :green[£{:,.2f}] being 
-            added in total due to tax relief""".format(monthly_deposit,
-                                            pension_monthly_net_deposit)
+            f"""Depositing :green[£{monthly_deposit:,.2f}] into your SIPP will result in :green[£{pension_monthly_net_deposit:,.2f}] being 
+            added in total due to tax relief"""
         )
         if current_tax == 'HRT':
-            st.warning("""(As a :green[{}] tax payer, only the first :green[£{:,.2f}] will be automatically added to your SIPP, 
-            the remaining :green[£{:,.2f}] will need to be reclaimed manually from HMRC)""".format(current_tax_const[0],
-                                                                                    monthly_deposit * 0.25,
-                                                                                    pension_monthly_net_deposit - monthly_deposit - monthly_deposit * 0.25))
+            st.warning(f"""(As a :green[{current_tax_const[0]}] tax payer, only the first :green[£{monthly_deposit * 0.25:,.2f}] will be automatically added to your SIPP, 
+            the remaining :green[£{pension_monthly_net_deposit - monthly_deposit - monthly_deposit * 0.25:,.2f}] will need to be reclaimed manually from HMRC)""")
         st.write(
-        """You expect to be a :green[{}] tax payer in retirement, so will pay :red[{:,.0f}%] tax. 
-        You do not pay national insurance on pension drawdown""".format(retirement_tax_const[0],
-                                                                        retirement_tax_const[1] * 100)
+        f"""You expect to be a :green[{retirement_tax_const[0]}] tax payer in retirement, so will pay :red[{retirement_tax_const[1] * 100:,.0f}%] tax. 
+        You do not pay national insurance on pension drawdown"""
         )
         st.write(
-            """To take home :green[£{:,.2f}] net from you pension, you would need to withdraw :green[£{:,.2f}]""".format(retirement_monthly_withdrawal, 
-                                                                                                            pension_monthly_net_withdrawal)
+            f"""To take home :green[£{retirement_monthly_withdrawal:,.2f}] net from you pension, you would need to withdraw :green[£{pension_monthly_net_withdrawal:,.2f}]"""
         )
         st.write(
-            """(Of your :green[£{:,.2f}] withdrawal, 25% (:green[£{:,.2f}]) can be taken tax free, and 
-            the remaining 75% (:green[£{:,.2f}]) is taxed as income (:red[£{:,.2f}] taken as tax leaving :green[£{:,.2f}] after tax). 
-            This totals :green[£{:,.2f}] net take home)""".format(pension_monthly_net_withdrawal,
-                                                            pension_monthly_net_withdrawal * 0.25,
-                                                            pension_monthly_net_withdrawal * 0.75,
-                                                            pension_monthly_net_withdrawal * 0.75 * retirement_tax_const[1],
-                                                            pension_monthly_net_withdrawal * 0.75 * (1 - retirement_tax_const[1]),
-                                                            retirement_monthly_withdrawal)
+            f"""(Of your :green[£{pension_monthly_net_withdrawal:,.2f}] withdrawal, 25% (:green[£{pension_monthly_net_withdrawal * 0.25:,.2f}]) can be taken tax free, and 
+            the remaining 75% (:green[£{pension_monthly_net_withdrawal * 0.75:,.2f}]) is taxed as income (:red[£{pension_monthly_net_withdrawal * 0.75 * retirement_tax_const[1]:,.2f}] taken as tax leaving :green[£{pension_monthly_net_withdrawal * 0.75 * (1 - retirement_tax_const[1]):,.2f}] after tax). 
+            This totals :green[£{retirement_monthly_withdrawal:,.2f}] net take home)"""
         )
 
         
 
     def detailedexplanationss():
         st.write(
-            """You are currently a :green[{0}] tax payer so pay :red[{1:.0f}%] tax and :red[{2:.0f}%] national insurance
-            """.format(current_tax_const[0],current_tax_const[1] * 100, current_tax_const[2] * 100))
+            f"""You are currently a :green[{current_tax_const[0]}] tax payer so pay :red[{current_tax_const[1] * 100:.0f}%] tax and :red[{current_tax_const[2] * 100:.0f}%] national insurance
+            """)
         st.write(
-            """Giving up :green[£{:,.2f}] of your net income would result in :green[£{:,.2f}] being 
-            deposited into your pension""".format(monthly_deposit,pension_monthly_net_deposit)
+            f"""Giving up :green[£{monthly_deposit:,.2f}] of your net income would result in :green[£{pension_monthly_net_deposit:,.2f}] being 
+            deposited into your pension"""
         )
         st.write(
-            """(:green[£{:,.2f}] of gross pay would normally incur :red[£{:,.2f}] in tax and :red[£{:,.2f}] in national insurance, 
-            resulting in :green[£{:,.2f}] net income. By salary sacrificing, all gross pay goes towards your pension)""".format(pension_monthly_net_deposit,
-                                                                                                                pension_monthly_net_deposit * current_tax_const[1],
-                                                                                                                pension_monthly_net_deposit * current_tax_const[2],
-                                                                                                                monthly_deposit)
+            f"""(:green[£{pension_monthly_net_deposit:,.2f}] of gross pay would normally incur :red[£{pension_monthly_net_deposit * current_tax_const[1]:,.2f}] in tax and :red[£{pension_monthly_net_deposit * current_tax_const[2]:,.2f}] in national insurance, 
+            resulting in :green[£{monthly_deposit:,.2f}] net income. By salary sacrificing, all gross pay goes towards your pension)"""
         )
         st.write(
-            """You expect to be a :green[{}] tax payer in retirement, so will pay :red[{:,.0f}%] tax. 
-            You do not pay national insurance on pension drawdown""".format(retirement_tax_const[0],
-                                                                        retirement_tax_const[1] * 100)
+            f"""You expect to be a :green[{retirement_tax_const[0]}] tax payer in retirement, so will pay :red[{retirement_tax_const[1] * 100:,.0f}%] tax. 
+            You do not pay national insurance on pension drawdown"""
         )
         st.write(
-            """To take home :green[£{:,.2f}] net from you pension, you would need to withdraw :green[£{:,.2f}]""".format(retirement_monthly_withdrawal, 
-                                                                                                            pension_monthly_net_withdrawal)
+            f"""To take home :green[£{retirement_monthly_withdrawal:,.2f}] net from you pension, you would need to withdraw :green[£{pension_monthly_net_withdrawal:,.2f}]"""
         )
         st.write(
-            """(Of your :green[£{:,.2f}] withdrawal, 25% (:green[£{:,.2f}]) can be taken tax free, and 
-            the remaining 75% (:green[£{:,.2f}]) is taxed as income (:red[£{:,.2f}] taken as tax leaving :green[£{:,.2f}] after tax). 
-            This totals :green[£{:,.2f}] net take home)""".format(pension_monthly_net_withdrawal,
-                                                            pension_monthly_net_withdrawal * 0.25,
-                                                            pension_monthly_net_withdrawal * 0.75,
-                                                            pension_monthly_net_withdrawal * 0.75 * retirement_tax_const[1],
-                                                            pension_monthly_net_withdrawal * 0.75 * (1 - retirement_tax_const[1]),
-                                                            retirement_monthly_withdrawal)
+            f"""(Of your :green[£{pension_monthly_net_withdrawal:,.2f}] withdrawal, 25% (:green[£{pension_monthly_net_withdrawal * 0.25:,.2f}]) can be taken tax free, and 
+            the remaining 75% (:green[£{pension_monthly_net_withdrawal * 0.75:,.2f}]) is taxed as income (:red[£{pension_monthly_net_withdrawal * 0.75 * retirement_tax_const[1]:,.2f}] taken as tax leaving :green[£{pension_monthly_net_withdrawal * 0.75 * (1 - retirement_tax_const[1]):,.2f}] after tax). 
+            This totals :green[£{retirement_monthly_withdrawal:,.2f}] net take home)"""
         )
 
 
@@ -587,25 +705,28 @@ with tab2:
 
 
 
-    pension_accumulation_df = accumulation_df[['Month','Net take home','Pension deposit','Pension fund','Growth']].copy()
-
-    pension_accumulation_df['Tax relief'] = pension_monthly_net_deposit * current_tax_const[1]
-
-    pension_accumulation_df['NI relief'] = pension_monthly_net_deposit * current_tax_const[2]
-
-    pension_drawdown_df = drawdown_df[['Month','Net take home','Pension deposit','Pension fund','Growth']].copy()
-
-    pension_drawdown_df['Tax relief'] = -pension_monthly_net_withdrawal * 0.75 * retirement_tax_const[1]
-
-    pension_drawdown_df['NI relief'] = 0
-
-    pension_schedule_df = pd.concat([pension_accumulation_df,pension_drawdown_df])
-
-    pension_schedule_df['Pension fund month returns'] = pension_schedule_df['Growth'] / 100 / 12 * pension_schedule_df['Pension fund']
+    pension_schedule_df = pd.DataFrame(
+        {
+            'Month': schedule_df['Month'].to_numpy(),
+            'Net take home': schedule_df['Net take home'].to_numpy(),
+            'Pension deposit': schedule_df['Pension deposit'].to_numpy(),
+            'Pension fund': schedule_df['Pension fund'].to_numpy(),
+            'Tax relief': np.repeat(
+                [pension_monthly_net_deposit * current_tax_const[1], -pension_monthly_net_withdrawal * 0.75 * retirement_tax_const[1]],
+                [retirement_age * 12, retirement_duration * 12]
+            ),
+            'NI relief': np.repeat(
+                [pension_monthly_net_deposit * current_tax_const[2], 0],
+                [retirement_age * 12, retirement_duration * 12]
+            ),
+            'Pension fund month returns': schedule_df['Pension fund month returns'].to_numpy()
+        }
+    )
 
 
 
-    with st.expander('Show accumulation/drawdown schedule'):
+    @st.fragment
+    def pensionscheduletable(pension_schedule_df, salary_sacrifice):
         show_pension_growth = st.toggle(
             'Show monthly pension fund investment returns?',
             help='''Will show the expected returns for a given month based on the size of the fund and
@@ -630,7 +751,11 @@ with tab2:
                         'Tax relief': st.column_config.NumberColumn(help='''Will appear as a positive number in accumulation (indicating relief), and a negative number in drawdown 
                                                                         (indicating tax paid)''')
                     })
-        
+
+
+    with st.expander('Show accumulation/drawdown schedule'):
+        pensionscheduletable(pension_schedule_df, salary_sacrifice)
+
     with st.expander('Show graph'):
         st.line_chart(pension_schedule_df,x='Month',y='Pension fund')
 
@@ -645,7 +770,7 @@ with tab3:
     )
 
     st.write(
-        '''Giving up :green[£{:,.2f}] of your net income would result in :green[£{:,.2f}] being deposited into your LISA'''.format(monthly_deposit,lisa_monthly_deposit)
+        f'''Giving up :green[£{monthly_deposit:,.2f}] of your net income would result in :green[£{lisa_monthly_deposit:,.2f}] being deposited into your LISA'''
     )
 
     st.write(
@@ -653,13 +778,24 @@ with tab3:
     )
 
     st.write(
-        '''To take home :green[£{0:,.2f}] net from your LISA, you would need to withdraw :green[£{0:,.2f}]'''.format(retirement_monthly_withdrawal)
+        f'''To take home :green[£{retirement_monthly_withdrawal:,.2f}] net from your LISA, you would need to withdraw :green[£{retirement_monthly_withdrawal:,.2f}]'''
     )
 
 
-    with st.expander('Show accumulation/drawdown schedule'):
+    lisa_schedule_df = build_lisa_schedule(
+        monthly_deposit,
+        lisa_monthly_deposit,
+        growth_rate,
+        retirement_age,
+        retirement_monthly_withdrawal,
+        retirement_growth_rate,
+        retirement_duration
+    )
 
 
+    @st.fragment
+    def lisascheduletable(lisa_schedule_df):
+
         show_lisa_growth = st.toggle(
             'Show monthly LISA fund investment returns?',
             help='''Will show the expected returns for a given month based on the size of the fund and
@@ -667,24 +803,17 @@ with tab3:
                     self sustaining (as desired when following the "4% rule" for example)'''
         )
 
-        accumulation_df['LISA bonus'] = accumulation_df['Net take home'] * -0.25
-        drawdown_df['LISA bonus'] = 0
-        lisa_schedule_df_columns = ['Month','Net take home','LISA bonus','LISA deposit','LISA fund','Growth']
-        lisa_schedule_df = pd.concat([accumulation_df[lisa_schedule_df_columns],drawdown_df[lisa_schedule_df_columns]])
+        lisa_schedule_df_columns = ['Month','Net take home','LISA bonus','LISA deposit','LISA fund']
 
         if show_lisa_growth:
-            lisa_schedule_df['LISA fund month returns'] = lisa_schedule_df['Growth'] / 100 / 12 * lisa_schedule_df['LISA fund']
-            lisa_schedule_df_columns.remove('Growth')
             lisa_schedule_df_columns.append('LISA fund month returns')
-            lisa_schedule_df.drop(columns=['Growth'],inplace=True)
 
-            st.dataframe(lisa_schedule_df.style.format('£{:,.2f}',lisa_schedule_df_columns[1:]),
-                    hide_index=True)
-        else:
-            lisa_schedule_df_columns.remove('Growth')
-            lisa_schedule_df.drop(columns=['Growth'],inplace=True)
-            st.dataframe(lisa_schedule_df.style.format('£{:,.2f}',lisa_schedule_df_columns[1:]),
-                    hide_index=True)    
+        st.dataframe(lisa_schedule_df[lisa_schedule_df_columns].style.format('£{:,.2f}',lisa_schedule_df_columns[1:]),
+                hide_index=True)
+
+
+    with st.expander('Show accumulation/drawdown schedule'):
+        lisascheduletable(lisa_schedule_df)
 
 
     with st.expander('Show graph'):
@@ -700,11 +829,16 @@ with tab3:
         \nTo see a detailed explanation of this, as well as alternative visual comparisons, toggle the below button'''
     )
 
-    show_detailed_lisa = st.toggle(
-        'Show LISA deposit/withdrawal age limitation impacts'
-    )
+    @st.fragment
+    def detailedlisa():
+
+        show_detailed_lisa = st.toggle(
+            'Show LISA deposit/withdrawal age limitation impacts'
+        )
+
+        if not show_detailed_lisa:
+            return
 
-    if show_detailed_lisa:
         st.write(
             '''The current age restriction for **withdrawing** from a LISA (without penalty) is **60**. The current 
             age restriction for **depositing** into a LISA is age **50**. This means there is **at minimum 10 
@@ -730,155 +864,65 @@ with tab3:
 
         if retirement_age <= 10:
             st.write(
-                '''As you selected a time until retirement of :green[{}] years, it is not possible to show you the impact this would 
-                have on your retirement funds, as you would not be able to make any contributions'''.format(retirement_age)
+                f'''As you selected a time until retirement of :green[{retirement_age}] years, it is not possible to show you the impact this would 
+                have on your retirement funds, as you would not be able to make any contributions'''
             )
         else:
-            st.write('''With :green[{}] years until retirement, you would be able to contribute to a LISA for 
-                    at most :green[{}] years'''.format(retirement_age,retirement_age-10))
-            st.write('''in :green[{}] years you could have accumulated:'''.format(retirement_age-10))
-        
-            retirement_fvs_10_years_less = -npf.fv(
-                growth_rate / 100 / 12,
-                (retirement_age - 10) * 12,
-                [pension_monthly_net_deposit,lisa_monthly_deposit,monthly_deposit],
-                0
+            st.write(f'''With :green[{retirement_age}] years until retirement, you would be able to contribute to a LISA for 
+                    at most :green[{retirement_age-10}] years''')
+            st.write(f'''in :green[{retirement_age-10}] years you could have accumulated:''')
+
+            (retirement_fvs_10_years_less, retirement_fvs_10_years_less_at_age, retirement_withdrawal_durations_10_years_less,
+             retirement_withdrawal_pmt_10_years_less, schedule_10_years_less_df) = build_10_years_less_schedule(
+                monthly_deposit,
+                pension_monthly_net_deposit,
+                lisa_monthly_deposit,
+                growth_rate,
+                retirement_age,
+                retirement_monthly_withdrawal,
+                pension_monthly_net_withdrawal,
+                retirement_growth_rate,
+                retirement_duration,
+                retirement_tax_const[1]
             )
 
-            for idx,i in enumerate(retirement_fvs_10_years_less):
-                st.write("\n* :green[£{:,.2f}] in your {}".format(i,retirement_vehicles[idx]))
+            st.markdown("\n".join(
+                f"* :green[£{i:,.2f}] in your {vehicle}"
+                for i, vehicle in zip(retirement_fvs_10_years_less, retirement_vehicles)
+            ))
 
             st.write('''After a further :green[10] years of growth (with no additional deposits), you could have accumulated:''')
 
-            retirement_fvs_10_years_less_at_age = -npf.fv(
-                growth_rate / 100 / 12,
-                10 * 12,
-                0,
-                retirement_fvs_10_years_less
-            )
-
-
-            for idx,i in enumerate(retirement_fvs_10_years_less_at_age):
-                st.write("\n* :green[£{:,.2f}] in your {}".format(i,retirement_vehicles[idx]))
+            st.markdown("\n".join(
+                f"* :green[£{i:,.2f}] in your {vehicle}"
+                for i, vehicle in zip(retirement_fvs_10_years_less_at_age, retirement_vehicles)
+            ))
 
 
             st.write(
-            """In order to receive :green[£{:,.2f}] net per month in retirement from these funds, you would need to withdraw:""".format(retirement_monthly_withdrawal))
-            st.write("""\n* :green[£{:,.2f}] a month from your pension""".format(pension_monthly_net_withdrawal))
+            f"""In order to receive :green[£{retirement_monthly_withdrawal:,.2f}] net per month in retirement from these funds, you would need to withdraw:""")
+            st.markdown("\n".join(
+                f"* :green[£{i:,.2f}] a month from your {vehicle}"
+                for i, vehicle in zip([pension_monthly_net_withdrawal, retirement_monthly_withdrawal, retirement_monthly_withdrawal], retirement_vehicles)
+            ))
 
-            st.write("""\n* :green[£{:,.2f}] a month from your LISA""".format(retirement_monthly_withdrawal))
 
-            st.write("""\n* :green[£{:,.2f}] a month from your ISA""".format(retirement_monthly_withdrawal))
+            st.write(f"This means you could receive :green[£{retirement_monthly_withdrawal:,.2f}] net a month (assuming your fund grows at :green[{retirement_growth_rate:,.2f}%]) for:")
 
 
-            retirement_withdrawal_durations_10_years_less = abs(npf.nper(
-            retirement_growth_rate / 100 / 12,
-            [-pension_monthly_net_withdrawal,-retirement_monthly_withdrawal,-retirement_monthly_withdrawal],
-            retirement_fvs_10_years_less_at_age
+            st.markdown("\n".join(
+                f"* :green[Forever] from your {vehicle}" if np.isnan(i)
+                else f"* :green[{i // 12:.0f} years] and :green[{i / 12 % 1 * 12:.0f} months] from your {vehicle}"
+                for i, vehicle in zip(retirement_withdrawal_durations_10_years_less, retirement_vehicles)
             ))
 
-            st.write("This means you could receive :green[£{:,.2f}] net a month (assuming your fund grows at :green[{:,.2f}%]) for:".format(retirement_monthly_withdrawal,retirement_growth_rate))
-
-
-            for idx, i in enumerate(retirement_withdrawal_durations_10_years_less):
-                if np.isnan(i):
-                    st.write("\n* :green[Forever] from your {}".format(retirement_vehicles[idx]))
-                else:
-                    st.write("\n* :green[{:.0f} years] and :green[{:.0f} months] from your {}".format(i / 12,i / 12 % 1 * 12, retirement_vehicles[idx]))
-
                     
-            retirement_withdrawal_pmt_10_years_less = -npf.pmt(
-                retirement_growth_rate / 100 / 12,
-                retirement_duration * 12,
-                retirement_fvs_10_years_less_at_age
-            )
-
-
-
-            retirement_withdrawal_pmt_10_years_less[0] = retirement_withdrawal_pmt_10_years_less[0] * 0.25 + retirement_withdrawal_pmt_10_years_less[0] * 0.75 * ((1 - brt_tax_rate) if retirement_tax == 'BRT' else (1-hrt_tax_rate))
-
-
-            st.write("Alternatively, by withdrawing consistently for exactly :green[{:.0f} years] you could be receiving:".format(retirement_duration))
-
-            for idx, i in enumerate(retirement_withdrawal_pmt_10_years_less):
-                st.write("\n* :green[£{:,.2f}] a month from your {}".format(i, retirement_vehicles[idx]))
-
+            st.write(f"Alternatively, by withdrawing consistently for exactly :green[{retirement_duration:.0f} years] you could be receiving:")
 
-            accumulation_10_years_less_df = accumulation_df.loc[:retirement_age*12-121,['Month','Growth','Net take home','Pension deposit','LISA deposit','ISA deposit','Pension fund','LISA fund','ISA fund']].copy()
-
-
-
-            accumulation_10_years_growth_df = pd.DataFrame({
-                'Month': np.arange(120) + (retirement_age * 12) - 119,
-                'Growth': growth_rate,
-                'Net take home': 0,
-                'Pension deposit': 0,
-                'LISA deposit': 0,
-                'ISA deposit': 0
-            })
-
-
-
-            accumulation_10_years_growth_df['Pension fund'] = -npf.fv(
-                growth_rate / 100 / 12,
-                accumulation_10_years_growth_df['Month'] - (retirement_age * 12 - 120),
-                0,
-                retirement_fvs_10_years_less[0]
-            )
-
-            accumulation_10_years_growth_df['LISA fund'] = -npf.fv(
-                growth_rate / 100 / 12,
-                accumulation_10_years_growth_df['Month'] - (retirement_age * 12 - 120),
-                0,
-                retirement_fvs_10_years_less[1]
-            )
-
-            accumulation_10_years_growth_df['ISA fund'] = -npf.fv(
-                growth_rate / 100 / 12,
-                accumulation_10_years_growth_df['Month'] - (retirement_age * 12 - 120),
-                0,
-                retirement_fvs_10_years_less[2]
-            )
-
-
-            drawdown_10_years_less_df = pd.DataFrame(
-                {
-                    'Month': drawdown_months + retirement_age * 12,
-                    'Growth': retirement_growth_rate,
-                    'Net take home': retirement_monthly_withdrawal,
-                    'Pension deposit': -pension_monthly_net_withdrawal,
-                    'LISA deposit': -retirement_monthly_withdrawal,
-                    'ISA deposit': -retirement_monthly_withdrawal
-                }
-            )
-
-            drawdown_10_years_less_df['Pension fund'] = -npf.fv(
-                retirement_growth_rate / 100 / 12,
-                drawdown_10_years_less_df['Month'] - retirement_age * 12,
-                drawdown_10_years_less_df['Pension deposit'],
-                retirement_fvs_10_years_less_at_age[0]
-            )
-
-
-            drawdown_10_years_less_df['LISA fund'] = -npf.fv(
-                retirement_growth_rate / 100 / 12,
-                drawdown_10_years_less_df['Month'] - retirement_age * 12,
-                drawdown_10_years_less_df['LISA deposit'],
-                retirement_fvs_10_years_less_at_age[1]
-            )
-
-            drawdown_10_years_less_df['ISA fund'] = -npf.fv(
-                retirement_growth_rate / 100 / 12,
-                drawdown_10_years_less_df['Month'] - retirement_age * 12,
-                drawdown_10_years_less_df['ISA deposit'],
-                retirement_fvs_10_years_less_at_age[2]
-            )
-
-            schedule_10_years_less_df = pd.concat([accumulation_10_years_less_df,accumulation_10_years_growth_df,drawdown_10_years_less_df])
-
-            schedule_10_years_less_df['Pension fund month returns'] = schedule_10_years_less_df['Growth'] / 100 / 12 * schedule_10_years_less_df['Pension fund']
-            schedule_10_years_less_df['LISA fund month returns'] = schedule_10_years_less_df['Growth'] / 100 / 12 * schedule_10_years_less_df['LISA fund']
-            schedule_10_years_less_df['ISA fund month returns'] = schedule_10_years_less_df['Growth'] / 100 / 12 * schedule_10_years_less_df['ISA fund']
+            st.markdown("\n".join(
+                f"* :green[£{i:,.2f}] a month from your {vehicle}"
+                for i, vehicle in zip(retirement_withdrawal_pmt_10_years_less, retirement_vehicles)
+            ))
 
 
             with st.expander('Show table'):
@@ -896,25 +940,9 @@ with tab3:
                 if show_lisa_10_years_less_growth:
                     lisa_10_years_less_columns.extend(['Pension fund month returns','LISA fund month returns','ISA fund month returns'])
 
-                lisa_10_years_less_columns_help = {}
-
-                for i in lisa_10_years_less_columns:
-                    if i == 'Month':
-                        pass
-                    elif i == 'Net take home':
-                        lisa_10_years_less_columns_help[i] = st.column_config.NumberColumn(help="""Amount taken/received net to you per month (will be negative when 
-                                                                    saving for retirement and positive when withdrawing)""")
-                    elif "deposit" in i:
-                        lisa_10_years_less_columns_help[i] = st.column_config.NumberColumn(help="""Amount which will be deposited/withdrawn from the fund by month""")
-                    elif "fund" in i:
-                        lisa_10_years_less_columns_help[i] = st.column_config.NumberColumn(help="""Total value of the fund by month (including growth)""")
-                    else:
-                        lisa_10_years_less_columns_help[i] = st.column_config.NumberColumn(help="""How much the fund generated each month based on it's value and the expected rate of return""")
-
-                    
                 st.dataframe(
                     schedule_10_years_less_df[lisa_10_years_less_columns].set_index('Month').style.format('£{:,.2f}'),
-                    column_config=lisa_10_years_less_columns_help
+                    column_config=schedule_column_config
                 )
 
 
@@ -924,12 +952,15 @@ with tab3:
                 st.line_chart(schedule_10_years_less_df,x='Month',y=['Pension fund','LISA fund','ISA fund'])
 
 
+    detailedlisa()
+
+
 
 with tab4:
 
     st.write(
-        """Giving up :green[£{:,.2f}] of your net income would result in :green[£{:,.2f}] being 
-        deposited into your pension""".format(monthly_deposit,monthly_deposit)
+        f"""Giving up :green[£{monthly_deposit:,.2f}] of your net income would result in :green[£{monthly_deposit:,.2f}] being 
+        deposited into your pension"""
     )
 
     st.write(
@@ -937,10 +968,11 @@ with tab4:
     )
 
     st.write(
-        """To take home :green[£{:,.2f}] net from your ISA, you would need to withdraw :green[£{:,.2f}]""".format(retirement_monthly_withdrawal,retirement_monthly_withdrawal)
+        f"""To take home :green[£{retirement_monthly_withdrawal:,.2f}] net from your ISA, you would need to withdraw :green[£{retirement_monthly_withdrawal:,.2f}]"""
     )
 
-    with st.expander('Show table'):
+    @st.fragment
+    def isascheduletable(schedule_df):
 
         show_isa_growth = st.toggle(
             'Show monthly ISA fund investment returns?',
@@ -950,18 +982,17 @@ with tab4:
             key='Show ISA growth toggle'
         )
 
-        isa_columns = ['Month','Net take home','ISA deposit','ISA fund']
-
-        isa_schedule_df = pd.concat([accumulation_df,drawdown_df])
-
         isa_schedule_columns = ['Month','Net take home','ISA deposit','ISA fund']
 
         if show_isa_growth:
-            isa_schedule_df['ISA fund month returns'] = isa_schedule_df['Growth'] / 100 / 12 * isa_schedule_df['ISA fund']
             isa_schedule_columns.append('ISA fund month returns')
         
         
-        st.dataframe(isa_schedule_df[isa_schedule_columns].set_index('Month').style.format('£{:,.2f}'))
+        st.dataframe(schedule_df[isa_schedule_columns].set_index('Month').style.format('£{:,.2f}'))
+
+
+    with st.expander('Show table'):
+        isascheduletable(schedule_df)
 
     with st.expander('Show graph'):
-        st.line_chart(isa_schedule_df,x='Month',y=['ISA fund'])
+        st.line_chart(schedule_df,x='Month',y=['ISA fund'])